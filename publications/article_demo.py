@@ -5,64 +5,180 @@ Demo script for the Medium article: Dremio + Nessie + Iceberg Training Environme
 This script executes all SQL commands from the article and validates the results
 by checking MinIO (via S3 API) and Nessie (via REST API) status.
 
-Requirements: pip install pyarrow boto3 requests
+Requirements: pip install pyarrow 'boto3>=1.36' requests
 """
 
 import os
 import sys
 import time
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+import pyarrow as pa
 import pyarrow.flight as flight
 import boto3
 from botocore.client import Config
 import requests
+from requests.adapters import HTTPAdapter
 
 # Configuration
-DREMIO_HOST = os.getenv("DREMIO_HOST", "localhost")
-DREMIO_FLIGHT_PORT = int(os.getenv("DREMIO_FLIGHT_PORT", "32010"))
-DREMIO_USERNAME = os.getenv("DREMIO_USERNAME", "admin")
-DREMIO_PASSWORD = os.getenv("DREMIO_PASSWORD", "password1")
+@dataclass(frozen=True)
+class DremioConfig:
+    """Dremio connection settings (immutable, safe to share across threads)"""
+    host: str
+    flight_port: int
+    username: str
+    password: str
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            host=os.getenv("DREMIO_HOST", "localhost"),
+            flight_port=int(os.getenv("DREMIO_FLIGHT_PORT", "32010")),
+            username=os.getenv("DREMIO_USERNAME", "admin"),
+            password=os.getenv("DREMIO_PASSWORD", "password1"),
+        )
+
+
+# Give every FlightClient its own TCP subchannel so concurrent calls don't queue
+DREMIO_FLIGHT_OPTIONS = [
+    ("grpc.use_local_subchannel_pool", 1),
+    ("grpc.max_receive_message_length", 64 * 1024 * 1024),
+]
 
 MINIO_ENDPOINT = os.getenv("MINIO_ENDPOINT", "http://localhost:9000")
 MINIO_ACCESS_KEY = os.getenv("MINIO_ACCESS_KEY", "admin")
 MINIO_SECRET_KEY = os.getenv("MINIO_SECRET_KEY", "password1")
 MINIO_BUCKET = "warehouse"
+# Parallel S3 round-trips (the boto3 client is thread-safe for these calls)
+MINIO_MAX_WORKERS = 16
+MINIO_CACHE_MAXSIZE = 128
 
 NESSIE_ENDPOINT = os.getenv("NESSIE_ENDPOINT", "http://localhost:19120")
+# Short-lived cache for Nessie REST reads; invalidated on every Dremio write
+NESSIE_CACHE_TTL = 5
+NESSIE_CACHE_MAXSIZE = 64
+
+# Statements that change catalog state (used to invalidate cached reads)
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE', 'CREATE', 'MERGE', 'DROP', 'ALTER')
+
+
+def is_write_statement(sql):
+    """Check whether a SQL statement mutates table or catalog state"""
+    words = sql.split(None, 1)
+    return bool(words) and words[0].upper() in WRITE_STATEMENTS
 
 
 class DremioClient:
     """Arrow Flight client for Dremio"""
 
-    def __init__(self):
+    def __init__(self, cfg=None):
+        self.cfg = cfg or DremioConfig.from_env()
         self.client = None
         self.token = None
+        self.options = None
+        # Callbacks run after each write statement (e.g. cache invalidation)
+        self.write_listeners = []
 
     def connect(self):
-        print(f"🔗 Connecting to Dremio at {DREMIO_HOST}:{DREMIO_FLIGHT_PORT}...")
-        location = flight.Location.for_grpc_tcp(DREMIO_HOST, DREMIO_FLIGHT_PORT)
-        self.client = flight.FlightClient(location)
-        self.token = self.client.authenticate_basic_token(DREMIO_USERNAME, DREMIO_PASSWORD)
+        print(f"🔗 Connecting to Dremio at {self.cfg.host}:{self.cfg.flight_port}...")
+        self.client = self._make_client()
+        self.token = self.client.authenticate_basic_token(self.cfg.username, self.cfg.password)
+        # Built once and shared by every call (including batch workers)
+        self.options = flight.FlightCallOptions(headers=[self.token])
         print("✅ Connected to Dremio\n")
 
-    def execute(self, sql, description=None):
+    def _make_client(self):
+        """Create a FlightClient with its own TCP connection"""
+        location = flight.Location.for_grpc_tcp(self.cfg.host, self.cfg.flight_port)
+        return flight.FlightClient(location, generic_options=DREMIO_FLIGHT_OPTIONS)
+
+    def _log_sql(self, sql, description=None):
         if description:
             print(f"📝 {description}")
         print(f"   SQL: {sql[:80]}{'...' if len(sql) > 80 else ''}")
 
+    def _open_stream(self, sql):
+        """Plan a statement and open its result stream (None if there is no result)"""
         flight_desc = flight.FlightDescriptor.for_command(sql)
-        options = flight.FlightCallOptions(headers=[self.token])
-        flight_info = self.client.get_flight_info(flight_desc, options=options)
-
+        flight_info = self.client.get_flight_info(flight_desc, options=self.options)
         if not flight_info.endpoints:
-            print("   ✅ Command executed\n")
             return None
+        return self.client.do_get(flight_info.endpoints[0].ticket, options=self.options)
+
+    def _notify_write(self, sql):
+        if is_write_statement(sql):
+            for listener in self.write_listeners:
+                listener()
+
+    def execute(self, sql, description=None):
+        self._log_sql(sql, description)
+
+        reader = self._open_stream(sql)
+        table = reader.read_all() if reader else None
+        self._notify_write(sql)
 
-        reader = self.client.do_get(flight_info.endpoints[0].ticket, options=options)
-        table = reader.read_all()
-        print(f"   ✅ Returned {table.num_rows} rows\n")
+        if table is None:
+            print("   ✅ Command executed\n")
+        else:
+            print(f"   ✅ Returned {table.num_rows} rows\n")
         return table
 
+    def execute_stream(self, sql, description=None):
+        """Execute a query and return its FlightStreamReader without reading it"""
+        self._log_sql(sql, description)
+
+        reader = self._open_stream(sql)
+        print("   ✅ Streaming results\n")
+        return reader
+
+    def execute_ddl(self, sql, description=None):
+        """Execute a DDL/DML statement whose result set is not needed"""
+        self._log_sql(sql, description)
+
+        # Dremio runs the job when the ticket is fetched, so still consume
+        # the stream, but drop the batches instead of building a Table
+        reader = self._open_stream(sql)
+        if reader:
+            for _ in reader:
+                pass
+        self._notify_write(sql)
+
+        print("   ✅ Command executed\n")
+
+    def execute_batch(self, sqls, description=None):
+        """Execute independent statements concurrently, one Flight client per worker"""
+        if not sqls:
+            return []
+        if description:
+            print(f"📝 {description}")
+        for sql in sqls:
+            self._log_sql(sql)
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(sqls)) as ex:
+                tables = list(ex.map(self._execute_on_own_client, sqls))
+        finally:
+            for sql in sqls:
+                self._notify_write(sql)
+
+        print(f"   ✅ Executed {len(sqls)} commands\n")
+        return tables
+
+    def _execute_on_own_client(self, sql):
+        """Run one statement on a dedicated FlightClient (own TCP subchannel)"""
+        client = self._make_client()
+        try:
+            flight_desc = flight.FlightDescriptor.for_command(sql)
+            flight_info = client.get_flight_info(flight_desc, options=self.options)
+            if not flight_info.endpoints:
+                return None
+            reader = client.do_get(flight_info.endpoints[0].ticket, options=self.options)
+            return reader.read_all()
+        finally:
+            client.close()
+
     def close(self):
         if self.client:
             self.client.close()
@@ -71,106 +187,200 @@ class DremioClient:
 class MinIOClient:
     """S3 client for MinIO"""
 
-    def __init__(self):
+    def __init__(self, use_cache=False):
         self.s3 = boto3.client(
             's3',
             endpoint_url=MINIO_ENDPOINT,
             aws_access_key_id=MINIO_ACCESS_KEY,
             aws_secret_access_key=MINIO_SECRET_KEY,
-            config=Config(signature_version='s3v4'),
+            config=Config(
+                signature_version='s3v4',
+                s3={'addressing_style': 'path'},
+                # Skip CRC32 on every request/response (listings are LIST-heavy)
+                request_checksum_calculation='when_required',
+                response_checksum_validation='when_required',
+                retries={'mode': 'standard', 'max_attempts': 3},
+                tcp_keepalive=True,
+                # Enough pooled connections for the parallel listings/deletes
+                max_pool_connections=32
+            ),
             region_name='us-east-1'
         )
+        # Opt-in cache of listing results, keyed on a generation counter that
+        # is bumped whenever the bucket contents are known to have changed
+        self.use_cache = use_cache
+        self._generation = 0
+        self._cache = {}
+        # Filled from the worker threads in collect_minio_status
+        self._cache_lock = threading.Lock()
+
+    def invalidate(self):
+        """Drop cached listings (call after anything that writes to the bucket)"""
+        with self._cache_lock:
+            self._generation += 1
+            self._cache = {}
+
+    def _cached(self, key, compute):
+        """Return compute() for key, memoized (LRU) for the current generation"""
+        if not self.use_cache:
+            return compute()
+        with self._cache_lock:
+            key = (self._generation,) + key
+            if key in self._cache:
+                # Move to the end so the least recently used entry is evicted first
+                value = self._cache[key] = self._cache.pop(key)
+                return value
+
+        # Listing runs outside the lock so parallel callers don't serialize
+        value = compute()
+        with self._cache_lock:
+            # A result computed before an invalidation is not stored
+            if key[0] == self._generation:
+                if key not in self._cache and len(self._cache) >= MINIO_CACHE_MAXSIZE:
+                    self._cache.pop(next(iter(self._cache)))
+                self._cache[key] = value
+        return value
+
+    def _paginate(self, **kwargs):
+        """Iterate over all list_objects_v2 pages (S3 returns at most 1000 keys per call)"""
+        paginator = self.s3.get_paginator('list_objects_v2')
+        return paginator.paginate(
+            Bucket=MINIO_BUCKET,
+            PaginationConfig={'PageSize': 1000},
+            **kwargs
+        )
+
+    def list_tables(self, only_non_empty=False, prefix=''):
+        """List all table folders in the warehouse bucket (optionally by name prefix)"""
+        folders = self._cached(
+            ('tables', only_non_empty, prefix),
+            lambda: self._list_tables(only_non_empty, prefix)
+        )
+        return list(folders)
+
+    def _list_tables(self, only_non_empty, prefix):
+        if only_non_empty:
+            return self._non_empty_folders(prefix)
 
-    def list_tables(self, only_non_empty=False):
-        """List all table folders in the warehouse bucket"""
-        response = self.s3.list_objects_v2(Bucket=MINIO_BUCKET, Delimiter='/')
         folders = []
-        for prefix in response.get('CommonPrefixes', []):
-            folder = prefix['Prefix'].rstrip('/')
-            if only_non_empty:
-                # Check if folder has any files
-                check = self.s3.list_objects_v2(
-                    Bucket=MINIO_BUCKET, Prefix=folder + '/', MaxKeys=1
-                )
-                if check.get('KeyCount', 0) == 0:
-                    continue
-            folders.append(folder)
+        for page in self._paginate(Delimiter='/', Prefix=prefix):
+            for common in page.get('CommonPrefixes', []):
+                folders.append(common['Prefix'].rstrip('/'))
         return folders
 
+    def _non_empty_folders(self, prefix=''):
+        """Top-level folders that contain at least one object, from one recursive listing"""
+        # dict keeps the listing's (lexicographic) order while de-duplicating
+        folders = {}
+        for page in self._paginate(Prefix=prefix):
+            for obj in page.get('Contents', []):
+                key = obj['Key']
+                if '/' in key:
+                    folders[key.split('/', 1)[0]] = True
+        return list(folders)
+
     def list_table_contents(self, table_prefix):
-        """List all files in a table folder"""
-        response = self.s3.list_objects_v2(Bucket=MINIO_BUCKET, Prefix=table_prefix)
-        files = []
-        for obj in response.get('Contents', []):
-            files.append({
-                'key': obj['Key'],
-                'size': obj['Size'],
-                'modified': obj['LastModified'].isoformat()
-            })
-        return files
+        """Yield all files in a table folder"""
+        for page in self._paginate(Prefix=table_prefix):
+            for obj in page.get('Contents', []):
+                yield {
+                    'key': obj['Key'],
+                    'size': obj['Size'],
+                    'modified': obj['LastModified'].isoformat()
+                }
 
     def get_table_stats(self, table_prefix):
         """Get statistics for a table"""
-        files = self.list_table_contents(table_prefix)
-        parquet_files = [f for f in files if f['key'].endswith('.parquet')]
-        metadata_files = [f for f in files if 'metadata' in f['key']]
+        stats = self._cached(
+            ('stats', table_prefix), lambda: self._get_table_stats(table_prefix)
+        )
+        return dict(stats)
+
+    def _get_table_stats(self, table_prefix):
+        # Single pass over the raw listing, without building per-file dicts
+        total = parquet = metadata = size = 0
+        for page in self._paginate(Prefix=table_prefix):
+            for obj in page.get('Contents', []):
+                key = obj['Key']
+                total += 1
+                size += obj['Size']
+                parquet += key.endswith('.parquet')
+                metadata += 'metadata' in key
         return {
-            'total_files': len(files),
-            'parquet_files': len(parquet_files),
-            'metadata_files': len(metadata_files),
-            'total_size_bytes': sum(f['size'] for f in files)
+            'total_files': total,
+            'parquet_files': parquet,
+            'metadata_files': metadata,
+            'total_size_bytes': size
         }
 
     def delete_table_files(self, table_prefix):
         """Delete all files in a table folder (cleanup after DROP TABLE)"""
-        files = self.list_table_contents(table_prefix)
-        if not files:
-            return 0
-
-        # S3 delete_objects expects a list of {'Key': ...}
-        objects_to_delete = [{'Key': f['key']} for f in files]
-
-        # Delete in batches of 1000 (S3 limit)
+        # S3 delete_objects expects a list of {'Key': ...}, at most 1000 per call.
+        # Batches are independent, so they are sent in parallel as they fill up.
         deleted_count = 0
-        for i in range(0, len(objects_to_delete), 1000):
-            batch = objects_to_delete[i:i+1000]
-            self.s3.delete_objects(
-                Bucket=MINIO_BUCKET,
-                Delete={'Objects': batch}
-            )
-            deleted_count += len(batch)
-
+        futures = []
+        batch = []
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            for f in self.list_table_contents(table_prefix):
+                batch.append({'Key': f['key']})
+                if len(batch) == 1000:
+                    futures.append(ex.submit(self._delete_batch, batch))
+                    batch = []
+            if batch:
+                futures.append(ex.submit(self._delete_batch, batch))
+
+            for future in futures:
+                deleted_count += future.result()
+
+        if deleted_count:
+            self.invalidate()
         return deleted_count
 
+    def _delete_batch(self, batch):
+        """Delete up to 1000 objects in one call"""
+        self.s3.delete_objects(
+            Bucket=MINIO_BUCKET,
+            Delete={'Objects': batch, 'Quiet': True}
+        )
+        return len(batch)
+
     def delete_empty_prefixes(self, prefix_filter='sales_'):
         """Delete empty folder markers (MinIO creates these for 'folders')"""
-        response = self.s3.list_objects_v2(Bucket=MINIO_BUCKET, Delimiter='/')
+        # MinIO can report folders without objects as CommonPrefixes, so compare
+        # the delimiter listing against a single recursive listing
+        non_empty = set(self._non_empty_folders(prefix_filter))
         deleted = 0
-        for prefix in response.get('CommonPrefixes', []):
-            folder = prefix['Prefix']
-            if not folder.startswith(prefix_filter):
-                continue
-            # Check if folder is empty
-            check = self.s3.list_objects_v2(
-                Bucket=MINIO_BUCKET, Prefix=folder, MaxKeys=1
+        to_delete = []
+        for page in self._paginate(Delimiter='/', Prefix=prefix_filter):
+            for prefix in page.get('CommonPrefixes', []):
+                folder = prefix['Prefix']
+                if folder.rstrip('/') not in non_empty:
+                    # Delete the folder marker object itself (both key variants)
+                    to_delete.append(folder)
+                    to_delete.append(folder.rstrip('/'))
+                    deleted += 1
+
+        # Delete all markers in batches of 1000 (S3 limit)
+        for i in range(0, len(to_delete), 1000):
+            batch = to_delete[i:i+1000]
+            self.s3.delete_objects(
+                Bucket=MINIO_BUCKET,
+                Delete={'Objects': [{'Key': k} for k in batch], 'Quiet': True}
             )
-            if check.get('KeyCount', 0) == 0:
-                # Delete the folder marker object itself
-                self.s3.delete_object(Bucket=MINIO_BUCKET, Key=folder)
-                self.s3.delete_object(Bucket=MINIO_BUCKET, Key=folder.rstrip('/'))
-                deleted += 1
+        if to_delete:
+            self.invalidate()
         return deleted
 
     def cleanup_sales_tables(self):
         """Remove all sales_* folders from previous runs"""
-        tables = self.list_tables()
+        # Always list live bucket contents before deleting
+        tables = self._list_tables(only_non_empty=False, prefix='sales_')
         total_deleted = 0
         for table in tables:
-            if table.startswith('sales_'):
-                count = self.delete_table_files(table)
-                if count > 0:
-                    total_deleted += count
-                    print(f"   Deleted {count} files from {table}")
+            count = self.delete_table_files(table)
+            if count > 0:
+                total_deleted += count
+                print(f"   Deleted {count} files from {table}")
         # Also remove empty folder markers
         self.delete_empty_prefixes('sales_')
         return total_deleted
@@ -181,94 +391,239 @@ class NessieClient:
 
     def __init__(self):
         self.base_url = f"{NESSIE_ENDPOINT}/api/v2"
+        # Keep-alive session so every call reuses a pooled connection
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # (method, url) -> (expires_at, etag, body)
+        self._cache = {}
+        # Bumped by invalidate(); responses fetched under an older
+        # generation are returned but never cached
+        self._generation = 0
+        self._cache_lock = threading.Lock()
+
+    def _get(self, path):
+        """GET a Nessie endpoint, served from the TTL cache when fresh"""
+        url = f"{self.base_url}{path}"
+        key = ('GET', url)
+        now = time.monotonic()
+        with self._cache_lock:
+            generation = self._generation
+            cached = self._cache.pop(key, None)
+            if cached:
+                self._cache[key] = cached
+            if cached and cached[0] > now:
+                return cached[2]
+
+        # Expired or invalidated: revalidate with the stored ETag if we have one
+        headers = {'If-None-Match': cached[1]} if cached and cached[1] else {}
+        response = self.session.get(url, headers=headers)
+        if response.status_code == 304:
+            etag, body = cached[1], cached[2]
+        else:
+            response.raise_for_status()
+            etag, body = response.headers.get('ETag'), response.json()
+
+        with self._cache_lock:
+            if generation == self._generation:
+                if key not in self._cache and len(self._cache) >= NESSIE_CACHE_MAXSIZE:
+                    # Evict the least recently used entry
+                    self._cache.pop(next(iter(self._cache)))
+                self._cache[key] = (now + NESSIE_CACHE_TTL, etag, body)
+        return body
+
+    def invalidate(self):
+        """Expire all cached reads (ETags are kept for conditional GETs)"""
+        with self._cache_lock:
+            self._generation += 1
+            self._cache = {
+                key: (0, etag, body) for key, (_, etag, body) in self._cache.items()
+            }
+
+    def _get_refs(self):
+        """Get all references (branches and tags) in a single call"""
+        return self._get("/trees").get('references', [])
 
     def get_branches(self):
         """Get all branches"""
-        response = requests.get(f"{self.base_url}/trees")
-        response.raise_for_status()
-        refs = response.json().get('references', [])
-        return [r for r in refs if r.get('type') == 'BRANCH']
+        return [r for r in self._get_refs() if r.get('type') == 'BRANCH']
 
     def get_tags(self):
         """Get all tags"""
-        response = requests.get(f"{self.base_url}/trees")
-        response.raise_for_status()
-        refs = response.json().get('references', [])
-        return [r for r in refs if r.get('type') == 'TAG']
+        return [r for r in self._get_refs() if r.get('type') == 'TAG']
 
     def get_tables(self, branch='main'):
         """Get all tables on a branch"""
-        response = requests.get(f"{self.base_url}/trees/{branch}/entries")
-        response.raise_for_status()
-        return response.json().get('entries', [])
+        return self._get(f"/trees/{branch}/entries").get('entries', [])
 
     def get_commit_log(self, branch='main', max_entries=5):
         """Get recent commits on a branch"""
-        response = requests.get(f"{self.base_url}/trees/{branch}/history")
-        response.raise_for_status()
-        entries = response.json().get('logEntries', [])
+        entries = self._get(f"/trees/{branch}/history").get('logEntries', [])
         return entries[:max_entries]
 
+    def close(self):
+        self.session.close()
 
-def print_table(table, max_rows=10):
-    """Pretty print an Arrow table"""
-    if table is None or table.num_rows == 0:
+
+def print_table(result, max_rows=10):
+    """Pretty print an Arrow table, or a Flight stream read only up to max_rows"""
+    if result is None:
         print("   (no rows)")
         return
 
-    cols = table.column_names
-    print("   " + " | ".join(f"{c:15}" for c in cols))
-    print("   " + "-" * (17 * len(cols)))
-
-    for i in range(min(table.num_rows, max_rows)):
-        row = [str(table.column(j)[i].as_py())[:15] for j in range(table.num_columns)]
-        print("   " + " | ".join(f"{v:15}" for v in row))
+    streaming = not isinstance(result, pa.Table)
+    batches = (chunk.data for chunk in result) if streaming else result.to_batches()
+
+    # Build the row format once per schema; '.15' truncates each cell
+    cols = result.schema.names
+    header = "   " + " | ".join(f"{c:15}" for c in cols)
+    separator = "   " + "-" * (17 * len(cols))
+    row_fmt = "   " + " | ".join(["%-15.15s"] * len(cols))
+
+    printed = 0
+    has_more = False
+    for batch in batches:
+        if batch.num_rows == 0:
+            continue
+        if printed == max_rows:
+            has_more = True
+            break
+        if printed == 0:
+            print(header)
+            print(separator)
+
+        # Convert each column to Python values in one bulk pass
+        head = batch.slice(0, max_rows - printed)
+        values = [c.to_pylist() for c in head.columns]
+        for row in zip(*values):
+            print(row_fmt % row)
+        printed += head.num_rows
+        if head.num_rows < batch.num_rows:
+            has_more = True
+            break
+
+    if printed == 0:
+        print("   (no rows)")
+        return
 
-    if table.num_rows > max_rows:
-        print(f"   ... and {table.num_rows - max_rows} more rows")
+    if has_more:
+        if streaming:
+            # Stop the server from sending the rest of the result
+            result.cancel()
+            print("   ... more rows not fetched")
+        else:
+            print(f"   ... and {result.num_rows - max_rows} more rows")
     print()
 
 
-def check_minio_status(minio, description):
-    """Check and print MinIO status"""
-    print(f"\n📦 MinIO Status: {description}")
+def collect_minio_status(minio):
+    """Collect stats for all sales tables (None if the bucket has no tables)"""
     tables = minio.list_tables(only_non_empty=True)
     if not tables:
+        return None
+
+    # Collect stats for all sales tables concurrently, keeping listing order
+    tables = [t for t in tables if 'sales' in t.lower()]
+    with ThreadPoolExecutor(max_workers=MINIO_MAX_WORKERS) as ex:
+        return dict(zip(tables, ex.map(minio.get_table_stats, tables)))
+
+
+def collect_nessie_status(nessie):
+    """Collect branches, tags and tables on main"""
+    # One /trees call, partitioned client-side
+    refs = nessie._get_refs()
+    branches = [r for r in refs if r.get('type') == 'BRANCH']
+    tags = [r for r in refs if r.get('type') == 'TAG']
+    return branches, tags, nessie.get_tables('main')
+
+
+def check_minio_status(minio, description, prefetched=None):
+    """Check and print MinIO status"""
+    print(f"\n📦 MinIO Status: {description}")
+    if prefetched is not None:
+        stats_map = prefetched.result()
+    else:
+        stats_map = collect_minio_status(minio)
+    if stats_map is None:
         print("   No tables found in warehouse bucket")
         return
 
     found_any = False
-    for table in tables:
-        if 'sales' in table.lower():
-            stats = minio.get_table_stats(table)
-            # Only show folders that have files
-            if stats['total_files'] > 0:
-                found_any = True
-                print(f"   Table folder: {table}")
-                print(f"   - Parquet files: {stats['parquet_files']}")
-                print(f"   - Metadata files: {stats['metadata_files']}")
-                print(f"   - Total size: {stats['total_size_bytes']} bytes")
+    for table, stats in stats_map.items():
+        # Only show folders that have files
+        if stats['total_files'] > 0:
+            found_any = True
+            print(f"   Table folder: {table}")
+            print(f"   - Parquet files: {stats['parquet_files']}")
+            print(f"   - Metadata files: {stats['metadata_files']}")
+            print(f"   - Total size: {stats['total_size_bytes']} bytes")
 
     if not found_any:
         print("   No sales tables found")
 
 
-def check_nessie_status(nessie, description):
+def check_nessie_status(nessie, description, prefetched=None):
     """Check and print Nessie status"""
     print(f"\n🌿 Nessie Status: {description}")
+    if prefetched is not None:
+        branches, tags, tables = prefetched.result()
+    else:
+        branches, tags, tables = collect_nessie_status(nessie)
 
-    branches = nessie.get_branches()
     print(f"   Branches: {[b['name'] for b in branches]}")
-
-    tags = nessie.get_tags()
     if tags:
         print(f"   Tags: {[t['name'] for t in tags]}")
 
-    tables = nessie.get_tables('main')
     if tables:
         print(f"   Tables on main: {[e['name']['elements'][-1] for e in tables]}")
 
 
+class StatusPrefetcher:
+    """Collects MinIO and Nessie status in the background.
+
+    Start it after the last write of a step; the status is then gathered
+    while Dremio runs the step's read-only queries. Any later write
+    discards the prefetched results, so a status check never shows stale data.
+    """
+
+    def __init__(self, minio, nessie):
+        self.minio = minio
+        self.nessie = nessie
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self._minio_future = None
+        self._nessie_future = None
+
+    def start(self, minio=True, nessie=True):
+        self.discard()
+        if minio:
+            self._minio_future = self.executor.submit(collect_minio_status, self.minio)
+        if nessie:
+            self._nessie_future = self.executor.submit(collect_nessie_status, self.nessie)
+
+    def discard(self):
+        """Drop pending results, waiting for fetches still in flight"""
+        pending = [f for f in (self._minio_future, self._nessie_future) if f is not None]
+        self._minio_future = None
+        self._nessie_future = None
+        # Let in-flight fetches finish before the caches are invalidated,
+        # so they can't store pre-write responses afterwards
+        wait(pending)
+
+    def minio_status(self):
+        """Prefetched MinIO status future (None if not available)"""
+        future, self._minio_future = self._minio_future, None
+        return future
+
+    def nessie_status(self):
+        """Prefetched Nessie status future (None if not available)"""
+        future, self._nessie_future = self._nessie_future, None
+        return future
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
 def main():
     print("=" * 70)
     print("🚀 Dremio + Nessie + Iceberg Demo Script")
@@ -277,24 +632,26 @@ def main():
     print()
 
     dremio = DremioClient()
-    minio = MinIOClient()
+    minio = MinIOClient(use_cache=True)
     nessie = NessieClient()
+    prefetch = StatusPrefetcher(minio, nessie)
+    # discard() runs first so in-flight prefetches finish before invalidation
+    dremio.write_listeners.append(prefetch.discard)
+    dremio.write_listeners.append(minio.invalidate)
+    dremio.write_listeners.append(nessie.invalidate)
 
     try:
         dremio.connect()
 
         # Cleanup from previous runs
         print("🧹 Cleanup: Removing any existing test data...")
+        # All statements are attempted even if one of them fails
         try:
-            dremio.execute("DROP TABLE IF EXISTS nessie.sales")
-        except:
-            pass
-        try:
-            dremio.execute("DROP BRANCH IF EXISTS dev IN nessie")
-        except:
-            pass
-        try:
-            dremio.execute("DROP TAG IF EXISTS v1_0_release IN nessie")
+            dremio.execute_batch([
+                "DROP TABLE IF EXISTS nessie.sales",
+                "DROP BRANCH IF EXISTS dev IN nessie",
+                "DROP TAG IF EXISTS v1_0_release IN nessie",
+            ])
         except:
             pass
 
@@ -313,7 +670,7 @@ def main():
         print("STEP 1: Create Table and Insert Data")
         print("=" * 70)
 
-        dremio.execute("""
+        dremio.execute_ddl("""
             CREATE TABLE nessie.sales (
                 order_id INT,
                 customer VARCHAR,
@@ -322,18 +679,20 @@ def main():
             )
         """, "Creating sales table")
 
-        dremio.execute("""
+        dremio.execute_ddl("""
             INSERT INTO nessie.sales VALUES
                 (1, 'Acme Corp', 1500.00, DATE '2024-01-10'),
                 (2, 'Globex Inc', 2300.00, DATE '2024-01-11'),
                 (3, 'Initech', 890.00, DATE '2024-01-12')
         """, "Inserting initial data")
 
-        result = dremio.execute("SELECT * FROM nessie.sales ORDER BY order_id", "Querying data")
+        # Status is gathered while Dremio runs the read-only query below
+        prefetch.start()
+        result = dremio.execute_stream("SELECT * FROM nessie.sales ORDER BY order_id", "Querying data")
         print_table(result)
 
-        check_minio_status(minio, "After CREATE and INSERT")
-        check_nessie_status(nessie, "After CREATE and INSERT")
+        check_minio_status(minio, "After CREATE and INSERT", prefetch.minio_status())
+        check_nessie_status(nessie, "After CREATE and INSERT", prefetch.nessie_status())
 
         # ============================================================
         # STEP 2: Schema Evolution
@@ -342,17 +701,18 @@ def main():
         print("STEP 2: Schema Evolution - Add Column")
         print("=" * 70)
 
-        dremio.execute("ALTER TABLE nessie.sales ADD COLUMNS (region VARCHAR)", "Adding region column")
+        dremio.execute_ddl("ALTER TABLE nessie.sales ADD COLUMNS (region VARCHAR)", "Adding region column")
 
-        dremio.execute("""
+        dremio.execute_ddl("""
             INSERT INTO nessie.sales VALUES
                 (4, 'Wayne Enterprises', 5000.00, DATE '2024-01-15', 'Northeast')
         """, "Inserting row with new column")
 
-        result = dremio.execute("SELECT * FROM nessie.sales ORDER BY order_id", "Querying with new schema")
+        prefetch.start(nessie=False)
+        result = dremio.execute_stream("SELECT * FROM nessie.sales ORDER BY order_id", "Querying with new schema")
         print_table(result)
 
-        check_minio_status(minio, "After Schema Evolution")
+        check_minio_status(minio, "After Schema Evolution", prefetch.minio_status())
 
         # ============================================================
         # STEP 3: Branching
@@ -361,39 +721,40 @@ def main():
         print("STEP 3: Branching - Git for Your Data")
         print("=" * 70)
 
-        dremio.execute("CREATE BRANCH dev IN nessie", "Creating dev branch")
+        dremio.execute_ddl("CREATE BRANCH dev IN nessie", "Creating dev branch")
         check_nessie_status(nessie, "After CREATE BRANCH")
 
         # Note: USE BRANCH changes the session context for subsequent queries
         # We use AT BRANCH for explicit reads to ensure correct data
-        dremio.execute("USE BRANCH dev IN nessie", "Switching to dev branch")
+        dremio.execute_ddl("USE BRANCH dev IN nessie", "Switching to dev branch")
 
-        dremio.execute("""
+        dremio.execute_ddl("""
             INSERT INTO nessie.sales AT BRANCH dev VALUES
                 (5, 'Stark Industries', 12000.00, DATE '2024-01-15', 'West')
         """, "Inserting on dev branch")
 
-        dremio.execute(
+        dremio.execute_ddl(
             "UPDATE nessie.sales AT BRANCH dev SET amount = 1600.00 WHERE order_id = 1",
             "Updating on dev branch"
         )
 
         print("\n📊 Data on DEV branch:")
-        result = dremio.execute("SELECT * FROM nessie.sales AT BRANCH dev ORDER BY order_id")
+        result = dremio.execute_stream("SELECT * FROM nessie.sales AT BRANCH dev ORDER BY order_id")
         print_table(result)
 
         print("📊 Data on MAIN branch (unchanged):")
-        result = dremio.execute("SELECT * FROM nessie.sales AT BRANCH main ORDER BY order_id")
+        result = dremio.execute_stream("SELECT * FROM nessie.sales AT BRANCH main ORDER BY order_id")
         print_table(result)
 
-        dremio.execute("MERGE BRANCH dev INTO main IN nessie", "Merging dev into main")
+        dremio.execute_ddl("MERGE BRANCH dev INTO main IN nessie", "Merging dev into main")
 
+        prefetch.start()
         print("📊 Data on MAIN after merge:")
-        result = dremio.execute("SELECT * FROM nessie.sales AT BRANCH main ORDER BY order_id")
+        result = dremio.execute_stream("SELECT * FROM nessie.sales AT BRANCH main ORDER BY order_id")
         print_table(result)
 
-        check_minio_status(minio, "After Branching and Merge")
-        check_nessie_status(nessie, "After Branching and Merge")
+        check_minio_status(minio, "After Branching and Merge", prefetch.minio_status())
+        check_nessie_status(nessie, "After Branching and Merge", prefetch.nessie_status())
 
         # ============================================================
         # STEP 4: Time Travel with Snapshots
@@ -415,13 +776,13 @@ def main():
         print(f"   ➡️  Current snapshot ID: {current_snapshot_id}\n")
 
         # Make a change
-        dremio.execute(
+        dremio.execute_ddl(
             "DELETE FROM nessie.sales WHERE amount < 1000",
             "Deleting low-value orders (Initech)"
         )
 
         print("📊 Data on MAIN after DELETE:")
-        result = dremio.execute("SELECT * FROM nessie.sales ORDER BY order_id")
+        result = dremio.execute_stream("SELECT * FROM nessie.sales ORDER BY order_id")
         print_table(result)
 
         # Query the history again to show the new snapshot
@@ -438,7 +799,7 @@ def main():
 
         # Time travel using the snapshot ID we captured earlier
         print(f"📊 Time travel: Data AT SNAPSHOT '{current_snapshot_id}' (before DELETE):")
-        result = dremio.execute(
+        result = dremio.execute_stream(
             f"SELECT * FROM nessie.sales AT SNAPSHOT '{current_snapshot_id}' ORDER BY order_id"
         )
         print_table(result)
@@ -451,29 +812,30 @@ def main():
         print("=" * 70)
 
         # Create a tag at the current state
-        dremio.execute(
+        dremio.execute_ddl(
             "CREATE TAG v1_0_release AT BRANCH main IN nessie",
             "Creating tag at current state"
         )
         check_nessie_status(nessie, "After CREATE TAG")
 
         # Insert new data after the tag
-        dremio.execute("""
+        dremio.execute_ddl("""
             INSERT INTO nessie.sales VALUES
                 (6, 'LexCorp', 8500.00, DATE '2024-01-20', 'South')
         """, "Inserting new row after tag")
 
+        prefetch.start(nessie=False)
         print("📊 Current data (includes new row):")
-        result = dremio.execute("SELECT * FROM nessie.sales ORDER BY order_id")
+        result = dremio.execute_stream("SELECT * FROM nessie.sales ORDER BY order_id")
         print_table(result)
 
         print("📊 Data AT TAG v1_0_release (before INSERT):")
-        result = dremio.execute(
+        result = dremio.execute_stream(
             "SELECT * FROM nessie.sales AT TAG v1_0_release ORDER BY order_id"
         )
         print_table(result)
 
-        check_minio_status(minio, "After Time Travel and Tagging")
+        check_minio_status(minio, "After Time Travel and Tagging", prefetch.minio_status())
 
         # ============================================================
         # FINAL STATUS
@@ -493,11 +855,12 @@ def main():
                     print(f"      {key} ({f['size']} bytes)")
 
         print("\n🌿 Nessie - Complete status:")
-        branches = nessie.get_branches()
+        refs = nessie._get_refs()
+        branches = [r for r in refs if r.get('type') == 'BRANCH']
         for b in branches:
             print(f"   Branch: {b['name']} (hash: {b['hash'][:8]}...)")
 
-        tags = nessie.get_tags()
+        tags = [r for r in refs if r.get('type') == 'TAG']
         for t in tags:
             print(f"   Tag: {t['name']} (hash: {t['hash'][:8]}...)")
 
@@ -514,9 +877,9 @@ def main():
         print("CLEANUP: Removing test data")
         print("=" * 70)
 
-        dremio.execute("DROP TAG v1_0_release IN nessie", "Dropping tag")
-        dremio.execute("DROP BRANCH dev IN nessie", "Dropping dev branch")
-        dremio.execute("DROP TABLE nessie.sales", "Dropping sales table")
+        dremio.execute_ddl("DROP TAG v1_0_release IN nessie", "Dropping tag")
+        dremio.execute_ddl("DROP BRANCH dev IN nessie", "Dropping dev branch")
+        dremio.execute_ddl("DROP TABLE nessie.sales", "Dropping sales table")
 
         # Important: DROP TABLE only removes the Nessie reference.
         # The actual files in MinIO remain until explicitly deleted.
@@ -536,7 +899,9 @@ def main():
         traceback.print_exc()
         return 1
     finally:
+        prefetch.close()
         dremio.close()
+        nessie.close()
 
 
 if __name__ == "__main__":
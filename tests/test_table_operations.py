@@ -85,10 +85,11 @@ def print_results(table):
     print(" | ".join(f"{col:15}" for col in column_names))
     print("-" * 80)
 
-    # Print rows
-    for i in range(table.num_rows):
-        row = [str(table.column(j)[i].as_py()) for j in range(table.num_columns)]
-        print(" | ".join(f"{val:15}" for val in row))
+    # Print rows (bulk-convert each column instead of per-cell scalar access)
+    row_fmt = " | ".join(["%-15s"] * table.num_columns)
+    columns = [col.to_pylist() for col in table.columns]
+    for row in zip(*columns):
+        print(row_fmt % row)
 
     print("-" * 80)
     print(f"Total rows: {table.num_rows}\n")